@@ -3,8 +3,15 @@ import { useToast } from "@/components/ui/use-toast";
 import { useQuiz } from "@/lib/QuizContext";
 import { Button } from "@/components/ui/button";
 import { Upload, Newspaper, FileUp } from "lucide-react";
-import { uploadFileAndCreateVectorStore, isVectorStoreReady } from "@/lib/vectorStore";
+import {
+  uploadFileAndCreateVectorStore,
+  isVectorStoreReady,
+  hashFile,
+  getCachedUpload,
+  cacheUpload,
+} from "@/lib/vectorStore";
 import { extractTextFromPDF } from "@/lib/pdfExtractor";
+import { debugLog } from "@/lib/utils";
 
 export default function FileUpload() {
   const { toast } = useToast();
@@ -12,12 +19,59 @@ export default function FileUpload() {
   const [isLoading, setIsLoading] = useState(false);
   const [fileName, setFileName] = useState<string | null>(null);
 
+  // Poll the vector store until its files are indexed, then report the outcome
+  const watchVectorStoreReadiness = useCallback(
+    async (vectorStoreId: string, isInitiallyReady: boolean = false) => {
+      // The creation response already reports file counts, so skip polling when indexing is done
+      let isReady = isInitiallyReady;
+      let attempts = 0;
+      
+      while (!isReady && attempts < 10) {
+        isReady = await isVectorStoreReady(vectorStoreId);
+        if (!isReady) {
+          await new Promise((resolve) => setTimeout(resolve, 1000));
+          attempts++;
+        }
+      }
+      
+      if (isReady) {
+        toast({
+          title: "Vector Store Ready",
+          description: "Your document has been processed and is ready for quizzing",
+        });
+      } else {
+        toast({
+          title: "Processing Document",
+          description: "Your document is still being processed and may take a few moments",
+        });
+      }
+    },
+    [toast]
+  );
+
   const handleFileUpload = useCallback(
     async (file: File) => {
       setIsLoading(true);
       try {
+        // Reuse the vector store from an earlier upload of the same file
+        const fileHash = await hashFile(file);
+        const cachedUpload = getCachedUpload(fileHash);
+        
+        if (cachedUpload) {
+          setVectorStoreId(cachedUpload.vectorStoreId);
+          setStudyMaterial(cachedUpload.text);
+          setFileName(file.name);
+          
+          toast({
+            title: "Success",
+            description: "This file was already processed, so it's ready for quizzing",
+          });
+          return;
+        }
+        
         let fileToUpload = file;
         let extractedText = "";
+        let failedPages: number[] = [];
         
         // Check if the file is a PDF, and if so, convert it to text
         if (file.type === "application/pdf") {
@@ -27,7 +81,7 @@ export default function FileUpload() {
           });
           
           // Extract text from PDF using GPT-4o's vision capabilities
-          extractedText = await extractTextFromPDF(file);
+          ({ text: extractedText, failedPages } = await extractTextFromPDF(file));
           
           // Verify we have meaningful content
           if (extractedText.length < 100 || extractedText.includes("Error extracting PDF content")) {
@@ -38,7 +92,7 @@ export default function FileUpload() {
           const textFileName = file.name.replace(".pdf", ".txt");
           fileToUpload = new File([extractedText], textFileName, { type: "text/plain" });
           
-          console.log("Successfully converted PDF to text, length:", extractedText.length);
+          debugLog("Successfully converted PDF to text, length:", extractedText.length);
         }
         
         // Upload the file and create a vector store
@@ -49,45 +103,26 @@ export default function FileUpload() {
           setVectorStoreId(result.vectorStoreId);
           
           // Also set the study material for fallback
-          if (extractedText) {
-            // If we already extracted text from PDF, use that
-            setStudyMaterial(extractedText);
-          } else {
-            // Otherwise, read the file content
-            const text = await file.text();
-            setStudyMaterial(text);
-          }
+          // If we already extracted text from PDF, use that; otherwise, read the file content
+          const studyText = extractedText || await file.text();
+          setStudyMaterial(studyText);
           
           setFileName(file.name);
           
+          // Don't remember incomplete text, so uploading the file again retries the failed pages
+          if (failedPages.length === 0) {
+            cacheUpload(fileHash, { vectorStoreId: result.vectorStoreId, text: studyText });
+          } else {
+            console.warn("Not caching upload; failed to extract PDF pages:", failedPages);
+          }
+          
           toast({
             title: "Success",
             description: "File uploaded and processed successfully",
           });
           
-          // Check if the vector store is ready
-          let isReady = false;
-          let attempts = 0;
-          
-          while (!isReady && attempts < 10) {
-            isReady = await isVectorStoreReady(result.vectorStoreId);
-            if (!isReady) {
-              await new Promise((resolve) => setTimeout(resolve, 1000));
-              attempts++;
-            }
-          }
-          
-          if (isReady) {
-            toast({
-              title: "Vector Store Ready",
-              description: "Your document has been processed and is ready for quizzing",
-            });
-          } else {
-            toast({
-              title: "Processing Document",
-              description: "Your document is still being processed and may take a few moments",
-            });
-          }
+          // Check readiness in the background so the upload controls are released right away
+          void watchVectorStoreReadiness(result.vectorStoreId, result.isReady);
         } else {
           throw new Error(result.error || "Failed to upload file");
         }
@@ -102,7 +137,7 @@ export default function FileUpload() {
         setIsLoading(false);
       }
     },
-    [setStudyMaterial, setVectorStoreId, toast]
+    [setStudyMaterial, setVectorStoreId, toast, watchVectorStoreReadiness]
   );
 
   const loadSampleContent = useCallback(async () => {
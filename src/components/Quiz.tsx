@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from "react";
-import { useQuiz } from "@/lib/QuizContext";
+import { evaluateAnswer, useQuiz } from "@/lib/QuizContext";
 import { Question, QuestionType, QuizPhase } from "@/lib/types";
 import { Button } from "./ui/button";
 import { Card, CardContent, CardFooter, CardHeader, CardTitle } from "./ui/card";
@@ -11,15 +11,16 @@ import { Progress } from "./ui/progress";
 import { AlertCircle, CheckCircle2, Clock, FileText, XCircle } from "lucide-react";
 import { Alert, AlertDescription, AlertTitle } from "./ui/alert";
 import { toast } from "@/components/ui/use-toast";
+import { debugLog } from "@/lib/utils";
 
 export const Quiz = () => {
   // Debug logging
-  console.log("Quiz component rendering");
+  debugLog("Quiz component rendering");
   
   const { state, submitAnswer, setPhase, setTotalQuizTime } = useQuiz();
   const { questions, currentQuestionIndex, userAnswers } = state;
   
-  console.log("Quiz state:", {
+  debugLog("Quiz state:", {
     questionsCount: questions.length,
     currentIndex: currentQuestionIndex,
     userAnswersCount: userAnswers.length
@@ -29,18 +30,18 @@ export const Quiz = () => {
   const questionsRef = useRef(questions);
   useEffect(() => {
     if (questions.length > 0) {
-      console.log("Updating questions ref");
+      debugLog("Updating questions ref");
       questionsRef.current = questions;
     }
   }, [questions]);
 
-  // Start time tracking
-  const [quizStartTime] = useState<Date>(new Date());
+  // Start time tracking, stored as epoch milliseconds so elapsed time needs no Date objects
+  const [quizStartTime] = useState<number>(() => Date.now());
   const [selectedAnswer, setSelectedAnswer] = useState<string>("");
   const [selectedMultipleAnswers, setSelectedMultipleAnswers] = useState<string[]>([]);
   const [descriptiveAnswer, setDescriptiveAnswer] = useState<string>("");
   const [timeLeft, setTimeLeft] = useState<number>(state.settings.timeLimit * 60);
-  const [questionStartTime, setQuestionStartTime] = useState<Date>(new Date());
+  const [questionStartTime, setQuestionStartTime] = useState<number>(() => Date.now());
   const [feedback, setFeedback] = useState<{
     show: boolean;
     isCorrect: boolean;
@@ -71,9 +72,7 @@ export const Quiz = () => {
     
     const timeTracker = setInterval(() => {
       // Calculate elapsed time
-      const elapsedSeconds = Math.floor(
-        (new Date().getTime() - quizStartTime.getTime()) / 1000
-      );
+      const elapsedSeconds = Math.floor((Date.now() - quizStartTime) / 1000);
       
       // If the quiz has a time limit, also update timeLeft
       if (state.settings.timeLimit > 0) {
@@ -100,18 +99,16 @@ export const Quiz = () => {
   // Store quiz time when quiz is completed
   useEffect(() => {
     if (isQuizCompleted && quizStartTime) {
-      const totalTimeInSeconds = Math.floor(
-        (new Date().getTime() - quizStartTime.getTime()) / 1000
-      );
-      console.log("Quiz completed, total time:", totalTimeInSeconds, "seconds");
+      const totalTimeInSeconds = Math.floor((Date.now() - quizStartTime) / 1000);
+      debugLog("Quiz completed, total time:", totalTimeInSeconds, "seconds");
       setTotalQuizTime(totalTimeInSeconds);
     }
   }, [isQuizCompleted, quizStartTime, setTotalQuizTime]);
 
   // Reset question start time when the question changes
   useEffect(() => {
-    console.log("Question index changed to:", currentQuestionIndex);
-    setQuestionStartTime(new Date());
+    debugLog("Question index changed to:", currentQuestionIndex);
+    setQuestionStartTime(Date.now());
     setSelectedAnswer("");
     setSelectedMultipleAnswers([]);
     setDescriptiveAnswer("");
@@ -178,7 +175,8 @@ export const Quiz = () => {
   // Handle checkbox change for multiple select
   const handleCheckboxChange = (id: string, checked: boolean) => {
     if (checked) {
-      setSelectedMultipleAnswers(prev => [...prev, id]);
+      // The checkbox and its row can both report the same click, so only add new ids
+      setSelectedMultipleAnswers(prev => (prev.includes(id) ? prev : [...prev, id]));
     } else {
       setSelectedMultipleAnswers(prev => prev.filter(item => item !== id));
     }
@@ -188,39 +186,36 @@ export const Quiz = () => {
   const handleSubmit = async () => {
     if (!currentQuestion || !isAnswerValid()) return;
 
-    const timeSpent = Math.floor(
-      (new Date().getTime() - questionStartTime.getTime()) / 1000
-    );
+    const timeSpent = Math.floor((Date.now() - questionStartTime) / 1000);
 
     const userAnswer = getCurrentAnswer();
-    console.log("Submitting answer:", userAnswer);
+    debugLog("Submitting answer:", userAnswer);
+
+    // Evaluate once and reuse the result for feedback and submission
+    const isCorrect = evaluateAnswer(currentQuestion, userAnswer);
 
     // Show feedback before moving to next question
     setFeedback({
       show: true,
       isCorrect: currentQuestion.type === "descriptive" 
         ? true // For descriptive questions, we don't show incorrect feedback
-        : typeof currentQuestion.correctAnswer === 'string' 
-          ? currentQuestion.correctAnswer === userAnswer 
-          : JSON.stringify(currentQuestion.correctAnswer.sort()) === JSON.stringify(userAnswer),
+        : isCorrect,
       explanation: currentQuestion.explanation || "",
     });
 
     // Wait 3 seconds before moving to next question
     setTimeout(() => {
-      console.log("Feedback timer completed, proceeding to next question");
-      submitAnswer(userAnswer, timeSpent);
+      debugLog("Feedback timer completed, proceeding to next question");
+      submitAnswer(userAnswer, timeSpent, isCorrect);
       
       // End quiz if it was the last question
       if (isLastQuestion) {
-        console.log("Last question completed, transitioning to results");
+        debugLog("Last question completed, transitioning to results");
         
         // Calculate and store total quiz time
         if (quizStartTime) {
-          const totalTimeInSeconds = Math.floor(
-            (new Date().getTime() - quizStartTime.getTime()) / 1000
-          );
-          console.log("Quiz completed, total time:", totalTimeInSeconds, "seconds");
+          const totalTimeInSeconds = Math.floor((Date.now() - quizStartTime) / 1000);
+          debugLog("Quiz completed, total time:", totalTimeInSeconds, "seconds");
           setTotalQuizTime(totalTimeInSeconds);
         }
         
@@ -274,37 +269,42 @@ export const Quiz = () => {
           </RadioGroup>
         );
         
-      case "multiple-select":
+      case "multiple-select": {
+        // Look up the selection once per render instead of per option attribute
+        const selectedIds = new Set(selectedMultipleAnswers);
+        
         return (
           <div className="space-y-3">
-            {currentQuestion.options.map((option) => (
-              <div 
-                key={option.id} 
-                className={`flex items-center space-x-2 rounded-lg border p-4 cursor-pointer transition-colors ${
-                  selectedMultipleAnswers.includes(option.id) ? "border-primary bg-primary/5" : "hover:bg-gray-50"
-                }`}
-                onClick={() => handleCheckboxChange(
-                  option.id, 
-                  !selectedMultipleAnswers.includes(option.id)
-                )}
-              >
-                <Checkbox 
-                  id={option.id}
-                  checked={selectedMultipleAnswers.includes(option.id)}
-                  onCheckedChange={(checked) => 
-                    handleCheckboxChange(option.id, checked === true)
-                  }
-                />
-                <Label
-                  htmlFor={option.id}
-                  className="flex-grow cursor-pointer font-normal"
+            {currentQuestion.options.map((option) => {
+              const isSelected = selectedIds.has(option.id);
+              
+              return (
+                <div 
+                  key={option.id} 
+                  className={`flex items-center space-x-2 rounded-lg border p-4 cursor-pointer transition-colors ${
+                    isSelected ? "border-primary bg-primary/5" : "hover:bg-gray-50"
+                  }`}
+                  onClick={() => handleCheckboxChange(option.id, !isSelected)}
                 >
-                  {option.text}
-                </Label>
-              </div>
-            ))}
+                  <Checkbox 
+                    id={option.id}
+                    checked={isSelected}
+                    onCheckedChange={(checked) => 
+                      handleCheckboxChange(option.id, checked === true)
+                    }
+                  />
+                  <Label
+                    htmlFor={option.id}
+                    className="flex-grow cursor-pointer font-normal"
+                  >
+                    {option.text}
+                  </Label>
+                </div>
+              );
+            })}
           </div>
         );
+      }
         
       case "descriptive":
         return (
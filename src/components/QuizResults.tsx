@@ -6,6 +6,7 @@ import { Progress } from "./ui/progress";
 import { callOpenAI } from "@/lib/openai";
 import { analyzeQuizWithAssistant } from "@/lib/assistantsApi";
 import { QuizResult } from "@/lib/types";
+import { debugLog } from "@/lib/utils";
 import {
   Award,
   BarChart3,
@@ -37,14 +38,14 @@ export const QuizResults = () => {
           return;
         }
 
-        console.log(`Analyzing results with total quiz time: ${totalQuizTime} seconds`);
+        debugLog("Analyzing results with total quiz time: %s seconds", totalQuizTime);
         
         let resultData;
         
         if (useAssistantApi) {
           // Use the new Assistants API integration
           try {
-            console.log("Using OpenAI Assistants API for analysis");
+            debugLog("Using OpenAI Assistants API for analysis");
             resultData = await analyzeQuizWithAssistant(userAnswers, totalQuizTime);
           } catch (error) {
             console.error("Assistants API failed, falling back to direct OpenAI call:", error);
@@ -65,7 +66,7 @@ export const QuizResults = () => {
           }
         } else {
           // Use the original direct OpenAI API call
-          console.log("Using direct OpenAI API call for analysis");
+          debugLog("Using direct OpenAI API call for analysis");
           const response = await callOpenAI("analyzePerformance", { 
             answers: userAnswers,
             includeProficiency: true,
@@ -1,9 +1,19 @@
 import { useState, useEffect, useCallback } from 'react';
 import { ProficiencyModel } from '@/lib/proficiencyModel';
 import { UserAnswer, ProficiencyData } from '@/lib/types';
+import { debugLog } from '@/lib/utils';
 
 const MODEL_STORAGE_KEY = 'quizorbital-proficiency-data';
 
+// Keep only the most recent results so storage and retraining stay bounded
+const MAX_STORED_RESULTS = 200;
+
+// Stored features and scores lie in [0, 1]; four decimals keeps the
+// serialized history a fraction of the size of full double precision
+const STORAGE_PRECISION = 10000;
+const quantize = (value: number): number =>
+  Math.round(value * STORAGE_PRECISION) / STORAGE_PRECISION;
+
 /**
  * Custom hook to use the proficiency prediction model
  */
@@ -23,12 +33,12 @@ export const useProficiencyModel = () => {
         
         // Try to load from storage
         const modelLoaded = await proficiencyModel.loadModel();
-        console.log(`Proficiency model ${modelLoaded ? 'loaded from storage' : 'initialized new'}`);
+        debugLog('Proficiency model %s', modelLoaded ? 'loaded from storage' : 'initialized new');
         
         // Load saved proficiency data
         const savedData = localStorage.getItem(MODEL_STORAGE_KEY);
         const parsedData: ProficiencyData[] = savedData ? JSON.parse(savedData) : [];
-        setProficiencyData(parsedData);
+        setProficiencyData(parsedData.slice(-MAX_STORED_RESULTS));
         
         setModel(proficiencyModel);
       } catch (error) {
@@ -64,12 +74,16 @@ export const useProficiencyModel = () => {
         // Save data if requested
         if (saveResult) {
           const newData: ProficiencyData = {
-            features,
-            score: proficiency,
+            features: features.map(quantize),
+            score: quantize(proficiency),
             timestamp: Date.now()
           };
           
-          const updatedData = [...proficiencyData, newData];
+          // Drop the oldest entries once the history reaches capacity
+          const updatedData = [
+            ...proficiencyData.slice(-(MAX_STORED_RESULTS - 1)),
+            newData
+          ];
           setProficiencyData(updatedData);
           
           // Save to localStorage
@@ -1,8 +1,9 @@
 import React, { createContext, useCallback, useContext, useReducer, useMemo, ReactNode, useRef, useEffect } from "react";
-import { Question, UserAnswer, QuizState, QuizSettings, QuizPhase, DifficultyLevel, PreAssessmentResults, QuizResult } from "./types";
+import { Question, QuestionType, UserAnswer, QuizState, QuizSettings, QuizPhase, DifficultyLevel, PreAssessmentResults, QuizResult } from "./types";
 import { toast } from "@/components/ui/use-toast";
 import { callOpenAI } from "./openai";
 import { extractTextFromPDF } from "./pdfExtractor";
+import { debugLog } from "./utils";
 
 // Initial quiz state
 const initialState: QuizState = {
@@ -45,7 +46,7 @@ export interface QuizContextType {
   startQuiz: () => void;
   nextQuestion: () => void;
   prevQuestion: () => void;
-  submitAnswer: (answer: string | string[], timeSpent: number) => void;
+  submitAnswer: (answer: string | string[], timeSpent: number, isCorrect?: boolean) => void;
   setStudyMaterial: (material: File | string) => void;
   setSettings: (settings: Partial<QuizSettings>) => void;
   setPhase: (phase: QuizPhase) => void;
@@ -122,13 +123,13 @@ export function QuizProvider({ children }: { children: ReactNode }) {
   // Update the backup whenever questions change
   useEffect(() => {
     if (state.questions.length > 0) {
-      console.log("Backing up questions:", state.questions.length);
+      debugLog("Backing up questions:", state.questions.length);
       questionsBackupRef.current = state.questions;
     }
   }, [state.questions]);
 
   const setPhase = useCallback((phase: QuizPhase) => {
-    console.log(`Setting phase to ${phase}`);
+    debugLog("Setting phase to %s", phase);
     
     // When transitioning to results phase, make sure we have user answers
     if (phase === QuizPhase.Results && state.userAnswers.length === 0 && state.questions.length > 0) {
@@ -170,14 +171,14 @@ export function QuizProvider({ children }: { children: ReactNode }) {
               variant: "default",
             });
             
-            content = await extractTextFromPDF(state.studyMaterial);
+            content = (await extractTextFromPDF(state.studyMaterial)).text;
             
             // Verify we have meaningful content
             if (content.length < 100 || content.includes("Error extracting PDF content")) {
               throw new Error("Could not extract meaningful content from the PDF");
             }
             
-            console.log("Successfully extracted PDF content, length:", content.length);
+            debugLog("Successfully extracted PDF content, length:", content.length);
           } else {
             content = await state.studyMaterial.text();
           }
@@ -195,7 +196,7 @@ export function QuizProvider({ children }: { children: ReactNode }) {
 
       // Generate questions using OpenAI
       try {
-        console.log("Calling OpenAI to generate questions");
+        debugLog("Calling OpenAI to generate questions");
         const response = await callOpenAI("generateQuestions", {
           content,
           numQuestions: state.settings.numQuestions,
@@ -206,7 +207,7 @@ export function QuizProvider({ children }: { children: ReactNode }) {
         });
 
         if (response.success && response.data) {
-          console.log(`Received ${response.data.length} questions from OpenAI`);
+          debugLog("Received %d questions from OpenAI", response.data.length);
           
           if (response.data.length === 0) {
             throw new Error("No questions were generated");
@@ -249,9 +250,10 @@ export function QuizProvider({ children }: { children: ReactNode }) {
   }, []);
 
   const submitAnswer = useCallback(
-    (answer: string | string[], timeSpent: number) => {
+    (answer: string | string[], timeSpent: number, evaluatedIsCorrect?: boolean) => {
       const question = state.questions[state.currentQuestionIndex];
-      const isCorrect = evaluateAnswer(question, answer);
+      // Skip re-evaluation when the caller already checked this answer
+      const isCorrect = evaluatedIsCorrect ?? evaluateAnswer(question, answer);
 
       const userAnswer: UserAnswer = {
         questionId: question.id,
@@ -301,7 +303,7 @@ export function QuizProvider({ children }: { children: ReactNode }) {
   }, []);
 
   const setTotalQuizTime = useCallback((timeInSeconds: number) => {
-    console.log("Setting total quiz time:", timeInSeconds);
+    debugLog("Setting total quiz time:", timeInSeconds);
     dispatch({ type: "SET_TOTAL_QUIZ_TIME", payload: timeInSeconds });
   }, []);
 
@@ -351,29 +353,60 @@ export function useQuiz() {
 }
 
 // Helper function to evaluate an answer
-function evaluateAnswer(question: Question, answer: string | string[]): boolean {
+export function evaluateAnswer(question: Question, answer: string | string[]): boolean {
   if (!question || !answer) return false;
 
-  switch (question.type) {
-    case "multiple-choice":
-    case "true-false":
-      return answer === question.correctAnswer;
-    case "multiple-select":
-      const correctAnswers = Array.isArray(question.correctAnswer)
-        ? question.correctAnswer
-        : [question.correctAnswer];
-      const userAnswers = Array.isArray(answer) ? answer : [answer];
-
-      // Check if arrays have the same length and all elements match
-      return (
-        correctAnswers.length === userAnswers.length &&
-        correctAnswers.every((item) => userAnswers.includes(item))
-      );
-    case "descriptive":
-      // For descriptive questions, we'll need to use AI to evaluate
-      // This is a placeholder that marks it as incorrect until evaluation
-      return false;
-    default:
-      return false;
+  // Dispatch on question type with a single lookup
+  const check = answerCheckers[question.type];
+  return check ? check(question, answer) : false;
+}
+
+type AnswerChecker = (question: Question, answer: string | string[]) => boolean;
+
+function checkSingleChoice(question: Question, answer: string | string[]): boolean {
+  return answer === question.correctAnswer;
+}
+
+// Normalized correct option ids per question, computed once per question
+const correctAnswerSets = new WeakMap<Question, Set<string>>();
+
+function getCorrectAnswerSet(question: Question): Set<string> {
+  let correctSet = correctAnswerSets.get(question);
+  if (!correctSet) {
+    // Generated questions store multiple-select answers as "a,b,d"
+    const correctAnswers = Array.isArray(question.correctAnswer)
+      ? question.correctAnswer
+      : question.correctAnswer.split(",");
+    correctSet = new Set(correctAnswers.map((item) => item.trim()));
+    correctAnswerSets.set(question, correctSet);
   }
-} 
\ No newline at end of file
+  return correctSet;
+}
+
+function checkMultipleSelect(question: Question, answer: string | string[]): boolean {
+  const correctSet = getCorrectAnswerSet(question);
+
+  // Dedupe the selection so repeated ids can't stand in for missing ones
+  const userSet = new Set(Array.isArray(answer) ? answer : [answer]);
+
+  // Check if both sets have the same size and all elements match
+  if (correctSet.size !== userSet.size) return false;
+  for (const item of userSet) {
+    if (!correctSet.has(item)) return false;
+  }
+  return true;
+}
+
+// For descriptive questions, we'll need to use AI to evaluate
+// This is a placeholder that marks it as incorrect until evaluation
+function checkDescriptive(): boolean {
+  return false;
+}
+
+// Answer checker for each question type
+const answerCheckers: Record<QuestionType, AnswerChecker> = {
+  "multiple-choice": checkSingleChoice,
+  "true-false": checkSingleChoice,
+  "multiple-select": checkMultipleSelect,
+  "descriptive": checkDescriptive,
+};
@@ -1,5 +1,19 @@
 import { openai } from "./openai";
 import { toast } from "@/components/ui/use-toast";
+import { debugLog } from "./utils";
+
+// File search configuration shared by the assistant and every run: a high score
+// threshold filters out metadata noise and fewer chunks keep answers focused
+const FILE_SEARCH_TOOL = {
+  type: "file_search" as const,
+  file_search: {
+    ranking_options: {
+      ranker: "auto" as const,
+      score_threshold: 0.8
+    },
+    max_num_results: 15
+  }
+};
 
 // Cache for assistants and threads
 let quizAssistantId: string | null = null;
@@ -32,20 +46,11 @@ export async function getOrCreateQuizAssistant() {
         "If you cannot find relevant educational content in the materials, state this clearly rather than " +
         "defaulting to questions about the document format itself.",
       model: "gpt-4o",
-      tools: [{ 
-        type: "file_search",
-        file_search: {
-          ranking_options: {
-            ranker: "auto",
-            score_threshold: 0.8 // Increased threshold to filter out more metadata noise
-          },
-          max_num_results: 15 // Limit the number of chunks for better focus
-        }
-      }],
+      tools: [FILE_SEARCH_TOOL],
     });
 
     quizAssistantId = assistant.id;
-    console.log("Created Quiz Assistant:", assistant.id);
+    debugLog("Created Quiz Assistant:", assistant.id);
     
     return { success: true, assistantId: assistant.id };
   } catch (error: any) {
@@ -92,7 +97,7 @@ export async function createQuizThread(vectorStoreId?: string) {
 
     // Create the thread
     const thread = await openai.beta.threads.create(options);
-    console.log("Created thread:", thread.id);
+    debugLog("Created thread:", thread.id);
     
     return { success: true, threadId: thread.id };
   } catch (error: any) {
@@ -135,16 +140,7 @@ export async function generateQuizQuestions(
     // Run the assistant
     const run = await openai.beta.threads.runs.create(threadId, {
       assistant_id: assistantId,
-      tools: [{
-        type: "file_search",
-        file_search: {
-          ranking_options: {
-            ranker: "auto",
-            score_threshold: 0.8 // Higher threshold to filter out metadata noise
-          },
-          max_num_results: 15 // Limit the number of chunks
-        }
-      }]
+      tools: [FILE_SEARCH_TOOL]
     });
 
     // Return run ID for polling
@@ -166,7 +162,8 @@ export async function checkRunStatus(threadId: string, runId: string) {
     
     // If completed, get the messages
     if (run.status === "completed") {
-      const messages = await openai.beta.threads.messages.list(threadId);
+      // Only the newest message is needed
+      const messages = await openai.beta.threads.messages.list(threadId, { order: "desc", limit: 1 });
       const lastMessage = messages.data[0]; // Last message is the assistant's response
       
       if (lastMessage.role === "assistant" && lastMessage.content[0].type === "text") {
@@ -214,16 +211,7 @@ export async function evaluateAnswer(
     // Run the assistant
     const run = await openai.beta.threads.runs.create(threadId, {
       assistant_id: assistantId,
-      tools: [{
-        type: "file_search",
-        file_search: {
-          ranking_options: {
-            ranker: "auto",
-            score_threshold: 0.8 // Consistent threshold
-          },
-          max_num_results: 15 // Limit the number of chunks
-        }
-      }]
+      tools: [FILE_SEARCH_TOOL]
     });
 
     // Return run ID for polling
@@ -257,16 +245,7 @@ export async function analyzePerformance(
     // Run the assistant
     const run = await openai.beta.threads.runs.create(threadId, {
       assistant_id: assistantId,
-      tools: [{
-        type: "file_search",
-        file_search: {
-          ranking_options: {
-            ranker: "auto",
-            score_threshold: 0.8 // Consistent threshold
-          },
-          max_num_results: 15 // Limit the number of chunks
-        }
-      }]
+      tools: [FILE_SEARCH_TOOL]
     });
 
     // Return run ID for polling
@@ -1,38 +1,78 @@
-import OpenAI from "openai";
 import { UserAnswer } from "./types";
 import { toast } from "@/components/ui/use-toast";
+import { openai } from "./openai";
 
-// Initialize OpenAI client with API key from environment variables
-let openaiClient: OpenAI;
+// Cache the assistant ID to avoid creating a new one each time
+let quizAnalysisAssistantId: string | null = null;
 
-try {
-  const apiKey = import.meta.env.VITE_OPENAI_API_KEY;
-  
-  if (!apiKey) {
-    console.warn("OpenAI API key not found in environment variables.");
-    throw new Error("API key not found");
+// The assistant ID is also persisted so page reloads reuse it until it expires
+const ANALYSIS_ASSISTANT_STORAGE_KEY = "quizorbital-analysis-assistant";
+const ANALYSIS_ASSISTANT_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+// Bump whenever the assistant's model, instructions or tools change, so stored
+// assistants created from an older definition are replaced instead of reused
+const ANALYSIS_ASSISTANT_CONFIG_VERSION = 1;
+
+// Read a persisted assistant ID, ignoring entries past their TTL or from an older config
+function loadStoredAssistantId(): string | null {
+  try {
+    const stored = localStorage.getItem(ANALYSIS_ASSISTANT_STORAGE_KEY);
+    if (!stored) return null;
+    
+    const { id, createdAt, version } = JSON.parse(stored);
+    if (
+      typeof id === "string" &&
+      version === ANALYSIS_ASSISTANT_CONFIG_VERSION &&
+      Date.now() - createdAt < ANALYSIS_ASSISTANT_TTL_MS
+    ) {
+      return id;
+    }
+    
+    localStorage.removeItem(ANALYSIS_ASSISTANT_STORAGE_KEY);
+  } catch (error) {
+    console.error("Error reading stored analysis assistant:", error);
   }
   
-  openaiClient = new OpenAI({
-    apiKey: apiKey,
-    dangerouslyAllowBrowser: true, // Required for browser environments
-  });
-  console.log("OpenAI client initialized successfully for Assistants API");
-} catch (error) {
-  console.error("Failed to initialize OpenAI client for Assistants API:", error);
+  return null;
 }
 
-// Cache the assistant ID to avoid creating a new one each time
-let quizAnalysisAssistantId: string | null = null;
+// Persist the assistant ID; a storage failure only costs the cache, not the assistant
+function storeAssistantId(id: string): void {
+  try {
+    localStorage.setItem(
+      ANALYSIS_ASSISTANT_STORAGE_KEY,
+      JSON.stringify({ id, createdAt: Date.now(), version: ANALYSIS_ASSISTANT_CONFIG_VERSION })
+    );
+  } catch (error) {
+    console.error("Error storing analysis assistant:", error);
+  }
+}
+
+// Forget the cached assistant ID so the next analysis creates a fresh assistant
+function clearStoredAssistantId(): void {
+  quizAnalysisAssistantId = null;
+  try {
+    localStorage.removeItem(ANALYSIS_ASSISTANT_STORAGE_KEY);
+  } catch (error) {
+    console.error("Error clearing stored analysis assistant:", error);
+  }
+}
 
 // Function to get or create the quiz analysis assistant
 export async function getQuizAnalysisAssistant(): Promise<string> {
   if (quizAnalysisAssistantId) {
     return quizAnalysisAssistantId;
   }
+  
+  const storedAssistantId = loadStoredAssistantId();
+  if (storedAssistantId) {
+    quizAnalysisAssistantId = storedAssistantId;
+    return storedAssistantId;
+  }
 
   try {
-    const assistant = await openaiClient.beta.assistants.create({
+    // Changes to this definition must bump ANALYSIS_ASSISTANT_CONFIG_VERSION
+    const assistant = await openai.beta.assistants.create({
       model: "gpt-4o",
       name: "Quiz Performance Analyzer",
       instructions: `You are an educational analytics expert. Provide insightful analysis of quiz performance data.
@@ -120,6 +160,7 @@ export async function getQuizAnalysisAssistant(): Promise<string> {
     });
 
     quizAnalysisAssistantId = assistant.id;
+    storeAssistantId(assistant.id);
     return assistant.id;
   } catch (error) {
     console.error("Error creating assistant:", error);
@@ -138,13 +179,13 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
     const assistantId = await getQuizAnalysisAssistant();
 
     // Create a thread for this analysis session
-    const thread = await openaiClient.beta.threads.create();
+    const thread = await openai.beta.threads.create();
 
     // Prepare the message with quiz data
     const totalQuestions = answers.length;
-    const correctAnswers = answers.filter(a => a.isCorrect).length;
+    const { correctAnswers, totalTimeSpent } = summarizeAnswers(answers);
     const averageTime = totalQuizTime ? (totalQuizTime / totalQuestions) : 
-                        (answers.reduce((sum, a) => sum + a.timeSpent, 0) / totalQuestions);
+                        (totalTimeSpent / totalQuestions);
     
     // Get subject area from questions
     const subjectArea = extractSubjectArea(answers);
@@ -174,13 +215,13 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
     `;
 
     // Add the message to the thread
-    await openaiClient.beta.threads.messages.create(thread.id, {
+    await openai.beta.threads.messages.create(thread.id, {
       role: "user",
       content: messageContent
     });
 
     // Run the assistant
-    const run = await openaiClient.beta.threads.runs.create(thread.id, {
+    const run = await openai.beta.threads.runs.create(thread.id, {
       assistant_id: assistantId
     });
 
@@ -190,16 +231,12 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
     // Handle run results
     if (completedRun.status === 'completed') {
       // Get the assistant's response
-      const messages = await openaiClient.beta.threads.messages.list(thread.id);
-      
       // The last assistant message will have the analysis
-      const assistantMessages = Array.from(messages.data)
-        .filter(msg => msg.role === 'assistant')
-        .sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
+      const assistantMessage = await getLatestAssistantMessage(thread.id);
       
-      if (assistantMessages.length > 0) {
+      if (assistantMessage) {
         // Process and format the assistant's response
-        return processAssistantResponse(assistantMessages[0], {
+        return processAssistantResponse(assistantMessage, {
           totalQuestions,
           correctAnswers,
           averageResponseTime: `${averageTime.toFixed(1)} seconds${totalQuizTime ? ` (${totalQuizTime} seconds total)` : ''}`
@@ -210,14 +247,15 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
       const toolCalls = completedRun.required_action?.submit_tool_outputs.tool_calls || [];
       
       const toolOutputs = await Promise.all(toolCalls.map(async (toolCall) => {
-        const args = JSON.parse(toolCall.function.arguments);
         let output = "{}";
         
         if (toolCall.function.name === "calculateAccuracyMetrics") {
+          const correctRatio = correctAnswers / totalQuestions;
+          // Longer quizzes weight the ratio up, clamped to [0.2, 0.9]
+          const lengthWeight = totalQuestions > 5 ? 1.2 : 1;
           output = JSON.stringify({
-            accuracy: ((correctAnswers / totalQuestions) * 100).toFixed(2),
-            proficiency: Math.min(0.9, Math.max(0.2, (correctAnswers / totalQuestions) * 
-              (totalQuestions > 5 ? 1.2 : 1))), // Adjust based on test length
+            accuracy: (correctRatio * 100).toFixed(2),
+            proficiency: Math.min(0.9, Math.max(0.2, correctRatio * lengthWeight)),
             suggestions: "Focus on understanding core concepts and practice more"
           });
         } else if (toolCall.function.name === "identifyStrengthsAndWeaknesses") {
@@ -229,12 +267,16 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
           });
         } else if (toolCall.function.name === "recommendTopics") {
           // Generate topic recommendations based on identified weaknesses
+          // Only this tool reads its arguments, so they are parsed here rather than for every call
+          const args = JSON.parse(toolCall.function.arguments);
           const weaknesses = args.weaknesses || [];
-          const recommendations = weaknesses.map(w => `${w} fundamentals`);
-          recommendations.push(`${subjectArea} practice exercises`);
+          
+          // A Set drops repeated weaknesses without scanning the list for each one
+          const recommendations = new Set<string>(weaknesses.map(w => `${w} fundamentals`));
+          recommendations.add(`${subjectArea} practice exercises`);
           
           output = JSON.stringify({
-            recommendedTopics: recommendations,
+            recommendedTopics: Array.from(recommendations),
             improvementStrategies: "Regular practice with focus on weak areas"
           });
         }
@@ -246,7 +288,7 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
       }));
       
       // Submit the tool outputs
-      const completedToolRun = await openaiClient.beta.threads.runs.submitToolOutputs(
+      const completedToolRun = await openai.beta.threads.runs.submitToolOutputs(
         thread.id,
         completedRun.id,
         { tool_outputs: toolOutputs }
@@ -256,14 +298,10 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
       const finalRun = await waitForRunCompletion(thread.id, completedToolRun.id);
       
       // Get the assistant's final response
-      const messages = await openaiClient.beta.threads.messages.list(thread.id);
-      
-      const assistantMessages = Array.from(messages.data)
-        .filter(msg => msg.role === 'assistant')
-        .sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
+      const assistantMessage = await getLatestAssistantMessage(thread.id);
       
-      if (assistantMessages.length > 0) {
-        return processAssistantResponse(assistantMessages[0], {
+      if (assistantMessage) {
+        return processAssistantResponse(assistantMessage, {
           totalQuestions,
           correctAnswers,
           averageResponseTime: `${averageTime.toFixed(1)} seconds${totalQuizTime ? ` (${totalQuizTime} seconds total)` : ''}`
@@ -277,6 +315,13 @@ export async function analyzeQuizWithAssistant(answers: UserAnswer[], totalQuizT
     throw new Error("Could not retrieve analysis results");
   } catch (error) {
     console.error("Error analyzing quiz with Assistant API:", error);
+    
+    // Only a 404 means the cached assistant no longer exists; other failures
+    // (timeouts, network errors, bad input) leave it valid for the next attempt
+    if ((error as { status?: number })?.status === 404) {
+      clearStoredAssistantId();
+    }
+
     toast({
       title: "Analysis Error",
       description: "Failed to analyze quiz results. Using backup analysis method.",
@@ -294,7 +339,7 @@ async function waitForRunCompletion(threadId: string, runId: string, maxAttempts
   let run;
   
   while (attempts < maxAttempts) {
-    run = await openaiClient.beta.threads.runs.retrieve(threadId, runId);
+    run = await openai.beta.threads.runs.retrieve(threadId, runId);
     
     if (run.status === 'completed' || run.status === 'requires_action' || 
         run.status === 'failed' || run.status === 'cancelled') {
@@ -309,6 +354,13 @@ async function waitForRunCompletion(threadId: string, runId: string, maxAttempts
   throw new Error('Run timed out');
 }
 
+// Fetch the newest assistant message, letting the API return messages newest-first
+// in a single small page instead of listing and sorting the whole thread
+async function getLatestAssistantMessage(threadId: string) {
+  const messages = await openai.beta.threads.messages.list(threadId, { order: "desc", limit: 5 });
+  return messages.data.find(msg => msg.role === 'assistant');
+}
+
 // Process and format the assistant's response
 function processAssistantResponse(assistantMessage: any, metrics: any) {
   const content = assistantMessage.content;
@@ -402,73 +454,88 @@ function processAssistantResponse(assistantMessage: any, metrics: any) {
   };
 }
 
+// Count correct answers and total time spent in a single pass
+function summarizeAnswers(answers: UserAnswer[]): { correctAnswers: number; totalTimeSpent: number } {
+  let correctAnswers = 0;
+  let totalTimeSpent = 0;
+  
+  for (const answer of answers) {
+    if (answer.isCorrect) correctAnswers++;
+    totalTimeSpent += answer.timeSpent;
+  }
+  
+  return { correctAnswers, totalTimeSpent };
+}
+
+// Subjects recognized in question text, in priority order
+const COMMON_SUBJECTS = [
+  'Mathematics', 'Science', 'History', 'Geography', 'Literature',
+  'Physics', 'Chemistry', 'Biology', 'Computer Science', 'Programming',
+  'Art', 'Music', 'Economics', 'Business', 'PDF', 'Font'
+];
+
+// Finds every subject in one scan; the lookahead lets overlapping names such as
+// "Science" inside "Computer Science" both be found
+const SUBJECT_PATTERN = new RegExp(`(?=(${COMMON_SUBJECTS.join('|')}))`, 'g');
+
 // Extract subject area from quiz questions
 function extractSubjectArea(answers: UserAnswer[]): string {
   // Try to determine the subject from questions
   const allText = answers.map(a => a.question || '').join(' ');
-  const commonSubjects = [
-    'Mathematics', 'Science', 'History', 'Geography', 'Literature',
-    'Physics', 'Chemistry', 'Biology', 'Computer Science', 'Programming',
-    'Art', 'Music', 'Economics', 'Business', 'PDF', 'Font'
-  ];
-  
-  for (const subject of commonSubjects) {
-    if (allText.includes(subject)) {
-      return subject;
-    }
-  }
+  const foundSubjects = new Set(Array.from(allText.matchAll(SUBJECT_PATTERN), match => match[1]));
   
   // Default fallback
-  return 'General Knowledge';
+  return COMMON_SUBJECTS.find(subject => foundSubjects.has(subject)) || 'General Knowledge';
 }
 
+// Question words that never name a topic, built once rather than per word
+const TOPIC_STOPWORDS = new Set(['what', 'which', 'where', 'when', 'explain', 'describe']);
+
 // Group questions by topic for strength/weakness analysis
 function groupQuestionsByTopic(answers: UserAnswer[]): Array<{topic: string, correctRate: number}> {
   // This is a simplified implementation that could be enhanced with NLP
   const topics = new Map<string, {correct: number, total: number}>();
   
   // Try to extract keywords from questions
-  answers.forEach(answer => {
-    if (!answer.question) return;
-    
-    // Very simple keyword extraction (could be improved)
-    const words = answer.question.split(/\s+/)
-      .filter(word => word.length > 4)
-      .map(word => word.replace(/[^\w]/g, ''))
-      .filter(word => !['what', 'which', 'where', 'when', 'explain', 'describe'].includes(word.toLowerCase()));
+  for (const answer of answers) {
+    if (!answer.question) continue;
     
-    // Take the most relevant words as potential topics
-    const potentialTopics = words.slice(0, 2);
+    // Very simple keyword extraction (could be improved): walk the words once and
+    // stop as soon as the two most relevant ones have been counted
+    let topicsFound = 0;
     
-    potentialTopics.forEach(topic => {
-      if (!topic) return;
+    for (const word of answer.question.split(/\s+/)) {
+      if (word.length <= 4) continue;
       
-      if (!topics.has(topic)) {
-        topics.set(topic, {correct: 0, total: 0});
+      const topic = word.replace(/[^\w]/g, '');
+      if (!topic || TOPIC_STOPWORDS.has(topic.toLowerCase())) continue;
+      
+      let topicData = topics.get(topic);
+      if (!topicData) {
+        topicData = {correct: 0, total: 0};
+        topics.set(topic, topicData);
       }
       
-      const topicData = topics.get(topic)!;
       topicData.total += 1;
       if (answer.isCorrect) {
         topicData.correct += 1;
       }
-    });
-  });
+      
+      if (++topicsFound === 2) break;
+    }
+  }
   
   // Convert to array and calculate rates
-  return Array.from(topics.entries())
-    .map(([topic, data]) => ({
-      topic,
-      correctRate: data.correct / data.total
-    }))
-    .filter(item => item.topic) // Remove empty topics
-    .sort((a, b) => b.correctRate - a.correctRate); // Sort by correctness
+  return Array.from(topics, ([topic, data]) => ({
+    topic,
+    correctRate: data.correct / data.total
+  })).sort((a, b) => b.correctRate - a.correctRate); // Sort by correctness
 }
 
 // Create a fallback analysis in case the Assistants API fails
 function createFallbackAnalysis(answers: UserAnswer[], totalQuizTime: number | null) {
   const totalQuestions = answers.length;
-  const correctAnswers = answers.filter(a => a.isCorrect).length;
+  const { correctAnswers, totalTimeSpent } = summarizeAnswers(answers);
   const accuracy = (correctAnswers / totalQuestions) * 100;
   
   let avgResponseTime;
@@ -476,7 +543,7 @@ function createFallbackAnalysis(answers: UserAnswer[], totalQuizTime: number | n
     avgResponseTime = Math.round(totalQuizTime / totalQuestions);
   } else {
     avgResponseTime = answers.length 
-      ? Math.round(answers.reduce((sum, a) => sum + a.timeSpent, 0) / answers.length)
+      ? Math.round(totalTimeSpent / answers.length)
       : 10;
   }
   
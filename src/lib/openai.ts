@@ -1,6 +1,7 @@
 import { toast } from "@/components/ui/use-toast";
 import { DifficultyLevel, QuestionType, PreAssessmentResults, QuestionTypeDistribution } from "./types";
 import OpenAI from "openai";
+import { debugLog } from "./utils";
 
 // Initialize OpenAI client with API key from environment variables
 export let openai: OpenAI;
@@ -12,40 +13,35 @@ function generateMockQuestions({ content, difficulty, count, questionTypes }: {
   count: number;
   questionTypes: QuestionType[];
 }) {
-  console.log("Generating mock questions:", count);
+  debugLog("Generating mock questions:", count);
   const questions = [];
   
-  // Extract some keywords from content for more relevant mock questions
-  const contentKeywords = content
-    .split(/\s+/)
-    .filter(word => word.length > 4)
-    .slice(0, 20);
+  // Extract some keywords from content for more relevant mock questions,
+  // scanning words lazily and stopping once enough have been found
+  const contentKeywords: string[] = [];
+  for (const [word] of content.matchAll(/\S+/g)) {
+    if (word.length <= 4) continue;
+    contentKeywords.push(word);
+    if (contentKeywords.length === 20) break;
+  }
   
   // If no keywords found, use default ones
   const keywords = contentKeywords.length > 0 
     ? contentKeywords 
     : ['concept', 'learning', 'knowledge', 'education', 'study', 'material', 'question', 'answer', 'quiz'];
   
-  // Map difficulty to numeric value
+  // Normalize difficulty for the generated questions
   const difficultyLevel = typeof difficulty === 'string' 
     ? difficulty.toLowerCase() 
     : difficulty;
   
-  const difficultyValue = {
-    'beginner': 1,
-    'easy': 2,
-    'medium': 3,
-    'hard': 4,
-    'expert': 5
-  }[difficultyLevel] || 3;
-  
   // Generate the requested number of questions
   for (let i = 0; i < count; i++) {
     // Determine question type (use provided types or default to multiple choice)
     const questionType = (questionTypes && questionTypes[i % questionTypes.length]) || 'multiple-choice';
     
-    // Get a random keyword for question content
-    const keyword = keywords[Math.floor(Math.random() * keywords.length)];
+    // Rotate through the keywords so questions don't repeat one until all have been used
+    const keyword = keywords[i % keywords.length];
     
     let question;
     
@@ -134,6 +130,28 @@ function generateMockQuestions({ content, difficulty, count, questionTypes }: {
   return questions;
 }
 
+// Compare comma-separated option selections as sets, without sorting or re-joining
+function isSameSelection(correctAnswer: string, userAnswer: string): boolean {
+  const correctIds = new Set(correctAnswer.split(',').map(id => id.trim()));
+  const selectedIds = new Set(userAnswer.split(',').map(id => id.trim()));
+  
+  // Compare deduped sets so repeated ids can't stand in for missing ones
+  if (correctIds.size !== selectedIds.size) return false;
+  for (const id of selectedIds) {
+    if (!correctIds.has(id)) return false;
+  }
+  return true;
+}
+
+// Fallback check for descriptive answers: at least 5 words and contains the opening
+// of the correct answer, lowercasing only that 15-character prefix
+function passesDescriptiveFallback(userAnswer: string, correctAnswer: string): boolean {
+  const minWords = 5;  // Require at least 5 words
+  if (userAnswer.trim().split(/\s+/).length < minWords) return false;
+  
+  return userAnswer.toLowerCase().includes(correctAnswer.substring(0, 15).toLowerCase());
+}
+
 function evaluateMockAnswer({ question, userAnswer }: any) {
   // Determine if the answer is correct based on question type
   let isCorrect = false;
@@ -160,10 +178,8 @@ function evaluateMockAnswer({ question, userAnswer }: any) {
         break;
         
       case 'multiple-select':
-        // Sort both arrays to ensure order doesn't matter
-        const correctAnswers = question.correctAnswer.split(',').sort().join(',');
-        const userAnswers = userAnswer.split(',').sort().join(',');
-        isCorrect = correctAnswers === userAnswers;
+        // Order of the selected options doesn't matter
+        isCorrect = isSameSelection(question.correctAnswer, userAnswer);
         feedback = isCorrect 
           ? "Correct! You selected all the right options." 
           : `Incorrect. The correct selections are: ${question.correctAnswer}.`;
@@ -276,7 +292,7 @@ try {
     apiKey: apiKey,
     dangerouslyAllowBrowser: true, // Required for browser environments
   });
-  console.log("OpenAI client initialized successfully");
+  debugLog("OpenAI client initialized successfully");
 } catch (error) {
   console.error("Failed to initialize OpenAI client:", error);
   // Create a dummy client that will be replaced with mock functions
@@ -296,7 +312,7 @@ export async function callOpenAI(
   payload: any
 ): Promise<OpenAIResponse> {
   try {
-    console.log(`Calling OpenAI endpoint: ${endpoint}`);
+    debugLog("Calling OpenAI endpoint: %s", endpoint);
     
     // For demo purposes, simulate an API call delay
     await new Promise((resolve) => setTimeout(resolve, 500));
@@ -373,7 +389,7 @@ async function generateQuestions({
       });
     }
     
-    console.log("Using question type distribution:", distribution);
+    debugLog("Using question type distribution:", distribution);
     
     // Calculate number of questions for each type
     distribution.forEach(dist => {
@@ -469,7 +485,7 @@ async function generateQuestions({
         // Always provide fallback questions regardless of whether we got results
         // If we got less than requested or empty array, use mock ones to fill the gap
         if (questions.length < numQuestions) {
-          console.log(`Only received ${questions.length}/${numQuestions} questions, adding mock questions`);
+          debugLog("Only received %d/%d questions, adding mock questions", questions.length, numQuestions);
           
           // If we don't have enough questions, use mock ones to fill the gap
           const additionalQuestions = generateMockQuestions({
@@ -491,7 +507,7 @@ async function generateQuestions({
         };
       } catch (error) {
         console.error("Failed to parse OpenAI response:", error);
-        console.log("Raw response:", responseContent);
+        debugLog("Raw response:", responseContent);
         throw new Error("Failed to parse response from OpenAI");
       }
     } catch (error) {
@@ -502,7 +518,7 @@ async function generateQuestions({
     console.error("Error generating questions:", error);
     
     // Always provide fallback questions if any error occurs
-    console.log("Falling back to mock questions");
+    debugLog("Falling back to mock questions");
     const mockQuestions = generateMockQuestions({ 
       content: content || "Sample content for mock questions", 
       difficulty, 
@@ -545,10 +561,8 @@ async function evaluateAnswer({
     
     // For multiple-select
     if (question.type === 'multiple-select') {
-      // Sort both arrays to ensure order doesn't matter
-      const correctAnswers = question.correctAnswer.split(',').sort().join(',');
-      const userAnswers = userAnswer.split(',').sort().join(',');
-      const isCorrect = correctAnswers === userAnswers;
+      // Order of the selected options doesn't matter
+      const isCorrect = isSameSelection(question.correctAnswer, userAnswer);
       
       return {
         success: true,
@@ -621,11 +635,7 @@ async function evaluateAnswer({
           
           // This is the important fix - don't automatically set isCorrect to true
           // Instead, implement a simple but meaningful validation
-          const userAnswerWords = userAnswer.trim().split(/\s+/).length;
-          const minWords = 5;  // Require at least 5 words
-          const isCorrect = userAnswerWords >= minWords && userAnswer.toLowerCase().includes(
-            question.correctAnswer.substring(0, 15).toLowerCase()
-          );
+          const isCorrect = passesDescriptiveFallback(userAnswer, question.correctAnswer);
           
           return {
             success: true,
@@ -643,11 +653,7 @@ async function evaluateAnswer({
         console.error("Error evaluating descriptive answer with OpenAI:", error);
         
         // Fallback evaluation method - same meaningful validation as above
-        const userAnswerWords = userAnswer.trim().split(/\s+/).length;
-        const minWords = 5;
-        const isCorrect = userAnswerWords >= minWords && userAnswer.toLowerCase().includes(
-          question.correctAnswer.substring(0, 15).toLowerCase()
-        );
+        const isCorrect = passesDescriptiveFallback(userAnswer, question.correctAnswer);
         
         return {
           success: true,
@@ -710,14 +716,15 @@ async function analyzePerformance({
     if (totalQuizTime) {
       // Use the total quiz time divided by number of questions
       averageResponseTime = Math.round(totalQuizTime * 1000 / totalQuestions);
-      console.log(`Using total quiz time: ${totalQuizTime}s for average calculation`);
+      debugLog("Using total quiz time: %ss for average calculation", totalQuizTime);
     } else {
       // Fall back to sum of individual answer times
       const totalResponseTime = answers.reduce((total, answer) => total + answer.timeSpent, 0);
       averageResponseTime = Math.round(totalResponseTime * 1000 / totalQuestions);
     }
     
-    // Prepare answer data for OpenAI
+    // Prepare answer data for OpenAI, serialized compactly below since pretty-printing
+    // only adds whitespace to the prompt
     const answerData = answers.map((answer, index) => {
       return {
         questionNumber: index + 1,
@@ -740,7 +747,7 @@ async function analyzePerformance({
       Average Response Time: ${totalQuizTime ? `${totalQuizTime / totalQuestions} seconds per question (${totalQuizTime} seconds total)` : `${averageResponseTime / 1000} seconds`}
       
       Detailed Answers:
-      ${JSON.stringify(answerData, null, 2)}
+      ${JSON.stringify(answerData)}
       
       Please provide:
       1. A list of strength areas (topics/concepts the user understands well)
@@ -1,20 +1,34 @@
 /**
  * Extracts text from a PDF file using GPT-4o's vision capabilities
- * This implementation first converts PDF pages to images, then sends them to GPT-4o
+ * Pages with an embedded text layer are read directly; the rest are converted
+ * to images and sent to GPT-4o
  * 
  * @param file The PDF file to extract text from
- * @returns Promise with the extracted text
+ * @returns Promise with the extracted text and the pages that could not be read
  */
 import { openai } from "./openai";
 import * as pdfjs from 'pdfjs-dist';
-import { PDFDocumentProxy } from 'pdfjs-dist';
+import { PDFDocumentProxy, PDFPageProxy } from 'pdfjs-dist';
+import { debugLog } from "./utils";
 
 // Set the PDF.js worker source
 pdfjs.GlobalWorkerOptions.workerSrc = `//cdnjs.cloudflare.com/ajax/libs/pdf.js/${pdfjs.version}/pdf.worker.min.js`;
 
-export async function extractTextFromPDF(file: File): Promise<string> {
+// Pages with less embedded text than this are treated as scanned images
+const MIN_TEXT_LAYER_LENGTH = 50;
+
+// Maximum number of pages extracted at once, keeping GPT-4o vision calls under rate limits
+const PAGE_CONCURRENCY = 4;
+
+// Result of a PDF extraction; failed pages are left out of the text
+export interface PDFExtractionResult {
+  text: string;
+  failedPages: number[];
+}
+
+export async function extractTextFromPDF(file: File): Promise<PDFExtractionResult> {
   try {
-    console.log("Extracting text from PDF using GPT-4o vision:", file.name);
+    debugLog("Extracting text from PDF using GPT-4o vision:", file.name);
     
     // Convert the PDF file to an ArrayBuffer
     const arrayBuffer = await file.arrayBuffer();
@@ -24,43 +38,57 @@ export async function extractTextFromPDF(file: File): Promise<string> {
     
     // Get PDF info
     const numPages = pdf.numPages;
-    console.log(`PDF has ${numPages} pages`);
+    debugLog("PDF has %d pages", numPages);
     
     // Limit the number of pages to process to avoid API limits
     const MAX_PAGES = 20; 
     const pagesToProcess = Math.min(numPages, MAX_PAGES);
     
     if (numPages > MAX_PAGES) {
-      console.warn(`PDF has more than ${MAX_PAGES} pages. Only the first ${MAX_PAGES} pages will be processed.`);
+      console.warn("PDF has more than %d pages. Only the first %d pages will be processed.", MAX_PAGES, MAX_PAGES);
     }
     
-    // Process each page and collect text
-    let allExtractedText = '';
-    
-    for (let i = 1; i <= pagesToProcess; i++) {
-      try {
-        console.log(`Processing page ${i} of ${pagesToProcess}`);
-        const pageText = await extractTextFromPage(pdf, i);
-        allExtractedText += pageText + '\n\n';
-      } catch (error) {
-        console.error(`Error processing page ${i}:`, error);
-        // Continue with next page
+    // Process pages a few at a time, storing each page's text at its own index
+    const pageTexts: string[] = new Array(pagesToProcess).fill('');
+    const failedPages: number[] = [];
+    let nextPage = 1;
+    
+    const processPages = async () => {
+      while (nextPage <= pagesToProcess) {
+        const i = nextPage++;
+        try {
+          debugLog("Processing page %d of %d", i, pagesToProcess);
+          pageTexts[i - 1] = await extractTextFromPage(pdf, i);
+        } catch (error) {
+          console.error("Error processing page %d:", i, error);
+          failedPages.push(i);
+          // Continue with next page
+        }
       }
-    }
+    };
+    
+    await Promise.all(
+      Array.from({ length: Math.min(PAGE_CONCURRENCY, pagesToProcess) }, processPages)
+    );
+    
+    // Join in page order regardless of which page finished first
+    const allExtractedText = pageTexts.map(text => text + '\n\n').join('');
     
     // Add a reminder to ignore PDF metadata
-    return `${allExtractedText.trim()}
+    const text = `${allExtractedText.trim()}
     
 IMPORTANT NOTE: The content above is purely educational material. Any metadata about PDF format, encoding, or document structure should be completely ignored when generating quiz questions.`;
+    
+    return { text, failedPages: failedPages.sort((a, b) => a - b) };
   } catch (error: any) {
     console.error("Error extracting text from PDF with GPT-4o vision:", error);
     
     // Fallback for errors
     if (error.message?.includes("This model's maximum context length")) {
-      return "The PDF is too large to process. Please try a smaller PDF or a text file instead.";
+      return { text: "The PDF is too large to process. Please try a smaller PDF or a text file instead.", failedPages: [] };
     }
     
-    return "Error extracting PDF content. Please try a different file.";
+    return { text: "Error extracting PDF content. Please try a different file.", failedPages: [] };
   }
 }
 
@@ -74,6 +102,13 @@ async function extractTextFromPage(pdf: PDFDocumentProxy, pageNum: number): Prom
   // Get the page
   const page = await pdf.getPage(pageNum);
   
+  // Use the embedded text layer when the page has one; only scanned or
+  // image-only pages need to be rendered and sent to GPT-4o
+  const embeddedText = await readTextLayer(page);
+  if (embeddedText.length >= MIN_TEXT_LAYER_LENGTH) {
+    return embeddedText;
+  }
+  
   // Get the viewport
   const viewport = page.getViewport({ scale: 1.5 }); // Higher scale for better resolution
   
@@ -127,6 +162,29 @@ async function extractTextFromPage(pdf: PDFDocumentProxy, pageNum: number): Prom
   return response.choices[0].message.content || "";
 }
 
+/**
+ * Reads the text layer PDF.js parses from the page's content stream
+ * @param page PDF page
+ * @returns The page text, or an empty string if the page has no text layer
+ */
+async function readTextLayer(page: PDFPageProxy): Promise<string> {
+  try {
+    const textContent = await page.getTextContent();
+    let text = '';
+    
+    for (const item of textContent.items) {
+      // Marked-content entries carry no text
+      if (!('str' in item)) continue;
+      text += item.str + (item.hasEOL ? '\n' : '');
+    }
+    
+    return text.trim();
+  } catch (error) {
+    console.error("Error reading PDF text layer:", error);
+    return '';
+  }
+}
+
 /**
  * Converts a file to base64 string
  * @param file File to convert
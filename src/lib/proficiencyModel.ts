@@ -1,5 +1,32 @@
 import * as tf from '@tensorflow/tfjs';
 import { UserAnswer } from './types';
+import { debugLog } from './utils';
+
+// Recency decays by a factor of e^-0.1 per day, folded into a per-millisecond rate
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
+const RECENCY_DECAY_PER_MS = 0.1 / MS_PER_DAY;
+
+// Numeric weight of each difficulty level, built once at module load
+const DIFFICULTY_WEIGHTS: ReadonlyMap<string, number> = new Map([
+  ['beginner', 0.2],
+  ['easy', 0.4],
+  ['medium', 0.6],
+  ['hard', 0.8],
+  ['expert', 1.0]
+]);
+
+/**
+ * Packs feature vectors row by row into one contiguous Float32Array so the
+ * tensor is created from a single buffer instead of nested arrays
+ */
+function packFeatures(featureVectors: number[][]): tf.Tensor2D {
+  const featureSize = featureVectors[0]?.length ?? 0;
+  const buffer = new Float32Array(featureVectors.length * featureSize);
+  
+  featureVectors.forEach((vector, row) => buffer.set(vector, row * featureSize));
+  
+  return tf.tensor2d(buffer, [featureVectors.length, featureSize]);
+}
 
 /**
  * ProficiencyModel - Neural network model to predict user proficiency
@@ -79,19 +106,38 @@ export class ProficiencyModel {
   public extractFeatures(
     userAnswers: UserAnswer[],
     confidenceScores: number[] = [],
-    lastInteractionTime: number = Date.now()
+    lastInteractionTime?: number
   ): number[] {
     // Return empty array if no answers
     if (!userAnswers.length) return Array(8).fill(0);
     
+    // Summarize correctness, streaks, response time and difficulty in a single pass
+    let correctCount = 0;
+    let totalResponseTime = 0;
+    let totalDifficulty = 0;
+    let currentStreak = 0;
+    let maxStreak = 0;
+    
+    for (const answer of userAnswers) {
+      if (answer.isCorrect) {
+        correctCount++;
+        currentStreak++;
+        if (currentStreak > maxStreak) maxStreak = currentStreak;
+      } else {
+        currentStreak = 0;
+      }
+      totalResponseTime += answer.timeSpent;
+      
+      // Get difficulty from the question if available
+      const difficulty = answer.difficulty || 'medium';
+      totalDifficulty += DIFFICULTY_WEIGHTS.get(difficulty.toLowerCase()) || 0.6;
+    }
+    
     // 1. Calculate correct ratio
-    const correctCount = userAnswers.filter(a => a.isCorrect).length;
     const correctRatio = correctCount / userAnswers.length;
     
     // 2. Calculate average response time
-    const avgResponseTime = userAnswers.reduce(
-      (sum, answer) => sum + answer.timeSpent, 0
-    ) / userAnswers.length;
+    const avgResponseTime = totalResponseTime / userAnswers.length;
     
     // Normalize response time (between 0-1)
     // Assuming 60 seconds as the maximum expected time
@@ -103,42 +149,19 @@ export class ProficiencyModel {
       : 0.5; // Default to middle value if not available
     
     // 4. Calculate question difficulty (based on the metadata if available)
-    const difficultyMap: Record<string, number> = {
-      'beginner': 0.2,
-      'easy': 0.4,
-      'medium': 0.6,
-      'hard': 0.8,
-      'expert': 1.0
-    };
-    
-    const avgDifficulty = userAnswers.reduce((sum, answer) => {
-      // Get difficulty from the question if available
-      const question = answer.difficulty || 'medium';
-      return sum + (difficultyMap[question.toLowerCase()] || 0.6);
-    }, 0) / userAnswers.length;
+    const avgDifficulty = totalDifficulty / userAnswers.length;
     
     // 5. Calculate recency factor (exponential decay)
-    const timeSinceLastInteractionMs = Date.now() - lastInteractionTime;
-    const daysSinceLastInteraction = timeSinceLastInteractionMs / (1000 * 60 * 60 * 24);
-    const recencyFactor = Math.exp(-0.1 * daysSinceLastInteraction);
+    // Without a last interaction time, the session is happening right now
+    const timeSinceLastInteractionMs = lastInteractionTime === undefined
+      ? 0
+      : Date.now() - lastInteractionTime;
+    const recencyFactor = Math.exp(-RECENCY_DECAY_PER_MS * timeSinceLastInteractionMs);
     
     // 6. Count of questions (normalized to 0-1, assuming 50 as max)
     const questionCount = Math.min(userAnswers.length / 50, 1);
     
-    // 7. Streak of consecutive correct answers
-    let currentStreak = 0;
-    let maxStreak = 0;
-    
-    for (const answer of userAnswers) {
-      if (answer.isCorrect) {
-        currentStreak++;
-        maxStreak = Math.max(maxStreak, currentStreak);
-      } else {
-        currentStreak = 0;
-      }
-    }
-    
-    // Normalize streak (assuming max streak of 10)
+    // 7. Streak of consecutive correct answers (normalized, assuming max streak of 10)
     const normalizedStreak = Math.min(maxStreak / 10, 1);
     
     // 8. Interaction term (correctRatio * confidenceScore)
@@ -174,8 +197,11 @@ export class ProficiencyModel {
     }
     
     // Convert inputs and outputs to tensors
-    const inputs = tf.tensor2d(featureVectors);
-    const outputs = tf.tensor2d(proficiencyValues, [proficiencyValues.length, 1]);
+    const inputs = packFeatures(featureVectors);
+    const outputs = tf.tensor2d(
+      Float32Array.from(proficiencyValues),
+      [proficiencyValues.length, 1]
+    );
     
     try {
       // Train the model
@@ -185,7 +211,7 @@ export class ProficiencyModel {
         shuffle: true,
         callbacks: {
           onEpochEnd: (epoch, logs) => {
-            console.log(`Epoch ${epoch + 1}: loss = ${logs?.loss}`);
+            debugLog('Epoch %d: loss = %s', epoch + 1, logs?.loss);
           }
         }
       });
@@ -222,32 +248,27 @@ export class ProficiencyModel {
     }
     
     try {
-      // Convert input to tensor
-      const input = tf.tensor2d([features]);
-      
-      // Get prediction
-      const prediction = this.model.predict(input);
-      
       // Extract predicted value (between 0-1)
-      const predictionValue = Array.isArray(prediction) 
-        ? prediction[0].dataSync()[0] 
-        : prediction.dataSync()[0];
-      
-      // Free tensor memory
-      input.dispose();
-      if (Array.isArray(prediction)) {
-        prediction.forEach(p => p.dispose());
-      } else {
-        prediction.dispose();
-      }
-      
-      return predictionValue;
+      return this.runModel([features])[0];
     } catch (error) {
       console.error('Error predicting proficiency:', error);
       return 0.5; // Return middle value as default
     }
   }
 
+  /**
+   * Runs the forward pass inside tf.tidy so every intermediate tensor
+   * is released by the engine, even when prediction throws
+   */
+  private runModel(featureVectors: number[][]): Float32Array {
+    return tf.tidy(() => {
+      const input = packFeatures(featureVectors);
+      const prediction = this.model!.predict(input);
+      const output = Array.isArray(prediction) ? prediction[0] : prediction;
+      return output.dataSync() as Float32Array;
+    });
+  }
+
   /**
    * Save model to browser's IndexedDB
    */
@@ -307,7 +328,7 @@ export class ProficiencyModel {
     } catch (error) {
       // Expected error on first run when no model exists yet
       if (error.message && error.message.includes('Cannot find model')) {
-        console.log('No saved model found. Using new model.');
+        debugLog('No saved model found. Using new model.');
       } else {
         console.error('Error loading proficiency model:', error);
       }
@@ -4,3 +4,11 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+// Development-only logging; production builds skip the console call and
+// any string formatting it would have done
+export function debugLog(...args: unknown[]) {
+  if (import.meta.env.DEV) {
+    console.log(...args)
+  }
+}
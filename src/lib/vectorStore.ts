@@ -1,5 +1,9 @@
 import { toast } from "@/components/ui/use-toast";
 import { openai } from "./openai";
+import { debugLog } from "./utils";
+
+// API key for direct file uploads, read from the build-time environment once
+const OPENAI_API_KEY: string | undefined = import.meta.env.VITE_OPENAI_API_KEY;
 
 // Interface for vector store creation
 export interface VectorStoreCreateParams {
@@ -14,6 +18,114 @@ export interface FileUploadResponse {
   fileId?: string;
   error?: string;
   vectorStoreId?: string;
+  isReady?: boolean;
+}
+
+// Interface for a previously processed upload
+export interface CachedUpload {
+  vectorStoreId: string;
+  text: string;
+}
+
+// Processed uploads are remembered per file hash for as long as the vector store lives
+const UPLOAD_CACHE_PREFIX = "quizorbital-upload-";
+const UPLOAD_CACHE_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+// Bounds on the cache so it leaves most of the shared ~5 MB localStorage quota to
+// the rest of the app; sizes are in UTF-16 characters of the stored JSON
+const UPLOAD_CACHE_MAX_ENTRIES = 5;
+const UPLOAD_CACHE_MAX_CHARS = 1_000_000;
+
+/**
+ * Computes the SHA-256 digest of a file's bytes with the native Web Crypto API
+ * @param file The file to hash
+ * @returns Promise with the hex-encoded digest
+ */
+export async function hashFile(file: File): Promise<string> {
+  const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0")).join("");
+}
+
+/**
+ * Looks up an earlier upload of the same file
+ * @param fileHash SHA-256 digest from hashFile
+ * @returns The cached upload, or null if none exists or it has expired
+ */
+export function getCachedUpload(fileHash: string): CachedUpload | null {
+  try {
+    const stored = localStorage.getItem(UPLOAD_CACHE_PREFIX + fileHash);
+    if (!stored) return null;
+    
+    const { vectorStoreId, text, createdAt } = JSON.parse(stored);
+    if (Date.now() - createdAt < UPLOAD_CACHE_TTL_MS) {
+      return { vectorStoreId, text };
+    }
+    
+    localStorage.removeItem(UPLOAD_CACHE_PREFIX + fileHash);
+  } catch (error) {
+    console.error("Error reading cached upload:", error);
+  }
+  
+  return null;
+}
+
+/**
+ * Remembers a processed upload so the same file can skip extraction and upload next time
+ * @param fileHash SHA-256 digest from hashFile
+ * @param upload The vector store and study text produced for the file
+ */
+export function cacheUpload(fileHash: string, upload: CachedUpload): void {
+  try {
+    const entry = JSON.stringify({ ...upload, createdAt: Date.now() });
+    
+    // Very large documents aren't worth evicting everything else for
+    if (entry.length > UPLOAD_CACHE_MAX_CHARS) return;
+    
+    evictCachedUploads(UPLOAD_CACHE_PREFIX + fileHash, entry.length);
+    localStorage.setItem(UPLOAD_CACHE_PREFIX + fileHash, entry);
+  } catch (error) {
+    // Storage may be full; the upload still succeeded
+    console.error("Error caching upload:", error);
+  }
+}
+
+/**
+ * Removes expired cache entries, then the oldest ones, until a new entry fits the limits
+ * @param newKey Storage key the new entry will be written to
+ * @param newSize Length of the new entry's JSON
+ */
+function evictCachedUploads(newKey: string, newSize: number): void {
+  const now = Date.now();
+  const entries: { key: string; size: number; createdAt: number }[] = [];
+  
+  for (let i = 0; i < localStorage.length; i++) {
+    const key = localStorage.key(i);
+    if (!key?.startsWith(UPLOAD_CACHE_PREFIX) || key === newKey) continue;
+    
+    const stored = localStorage.getItem(key) ?? "";
+    let createdAt = 0;
+    try {
+      createdAt = JSON.parse(stored).createdAt ?? 0;
+    } catch {
+      // Unreadable entries are treated as oldest and evicted first
+    }
+    entries.push({ key, size: stored.length, createdAt });
+  }
+  
+  // Oldest first, so expired entries and then the least recent ones go
+  entries.sort((a, b) => a.createdAt - b.createdAt);
+  
+  let totalSize = newSize + entries.reduce((sum, entry) => sum + entry.size, 0);
+  let count = entries.length + 1;
+  
+  for (const entry of entries) {
+    const isExpired = now - entry.createdAt >= UPLOAD_CACHE_TTL_MS;
+    if (!isExpired && totalSize <= UPLOAD_CACHE_MAX_CHARS && count <= UPLOAD_CACHE_MAX_ENTRIES) break;
+    
+    localStorage.removeItem(entry.key);
+    totalSize -= entry.size;
+    count--;
+  }
 }
 
 /**
@@ -27,20 +139,19 @@ export async function uploadFileAndCreateVectorStore(
   name: string = "Quizorbis Study Material"
 ): Promise<FileUploadResponse> {
   try {
+    if (!OPENAI_API_KEY) {
+      throw new Error("OpenAI API key not found in environment variables");
+    }
+
     // First upload the file to OpenAI
     const formData = new FormData();
     formData.append("file", file);
     formData.append("purpose", "assistants");
 
-    const apiKey = import.meta.env.VITE_OPENAI_API_KEY;
-    if (!apiKey) {
-      throw new Error("OpenAI API key not found in environment variables");
-    }
-
     const fileUploadResponse = await fetch("https://api.openai.com/v1/files", {
       method: "POST",
       headers: {
-        Authorization: `Bearer ${apiKey}`,
+        Authorization: `Bearer ${OPENAI_API_KEY}`,
       },
       body: formData,
     });
@@ -65,13 +176,17 @@ export async function uploadFileAndCreateVectorStore(
       // If custom chunking is needed, update based on the latest API documentation
     });
 
-    console.log("Vector store created:", vectorStoreResponse);
+    debugLog("Vector store created:", vectorStoreResponse);
 
-    // Return success response
+    // Return success response, including whether indexing already finished
+    // so callers can skip polling for small files
     return {
       success: true,
       fileId,
       vectorStoreId: vectorStoreResponse.id,
+      isReady:
+        vectorStoreResponse.file_counts.total > 0 &&
+        vectorStoreResponse.file_counts.in_progress === 0,
     };
   } catch (error: any) {
     console.error("Error uploading file or creating vector store:", error);